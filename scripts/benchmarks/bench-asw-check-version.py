@@ -0,0 +1,218 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# dependencies = [
+#     "requests",
+#     "tabulate",
+#     "colorama; sys_platform == 'win32'",
+# ]
+# ///
+
+"""
+Benchmarks for asw-check-version
+
+Generates throwaway repository trees and times the old and new code paths
+side by side. Nothing outside the temporary directory is touched.
+
+Usage:
+    bench-asw-check-version.py git-metadata [--repos 200] [--keep]
+    bench-asw-check-version.py startup [--repos 50] [--runs 10] [--baseline OLD_SCRIPT] [--keep]
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CHECKER_PATH = SCRIPT_DIR.parent / "asw-check-version"
+
+GIT_ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME="ASW Bench",
+    GIT_AUTHOR_EMAIL="bench@asw.invalid",
+    GIT_COMMITTER_NAME="ASW Bench",
+    GIT_COMMITTER_EMAIL="bench@asw.invalid",
+)
+
+
+def load_checker():
+    """Import the extensionless asw-check-version script as a module"""
+    loader = importlib.machinery.SourceFileLoader("asw_check_version", str(CHECKER_PATH))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, env=GIT_ENV, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def generate_tree(root: Path, repo_count: int):
+    """Create projects/<group>/<repo> repositories with some heavy build directories"""
+    projects = root / "projects"
+    for i in range(repo_count):
+        repo = projects / f"group-{i % 10:02d}" / f"repo-{i:03d}"
+        repo.mkdir(parents=True)
+        git("init", "-q", cwd=repo)
+        (repo / "README.md").write_text(f"repo {i}\n")
+        git("add", "README.md", cwd=repo)
+        git("commit", "-q", "-m", "initial", cwd=repo)
+        git("remote", "add", "origin", f"git@github.com:asw-bench/repo-{i:03d}.git", cwd=repo)
+        if i % 2:
+            # Freshly cloned repositories keep their objects in packs
+            git("repack", "-adq", cwd=repo)
+            git("pack-refs", "--all", cwd=repo)
+        if i % 4 == 0:
+            # A node_modules tree the old rglob walk had to crawl through
+            for package in range(50):
+                package_dir = repo / "node_modules" / f"pkg-{package}" / "lib"
+                package_dir.mkdir(parents=True)
+                (package_dir / "index.js").write_text("module.exports = {};\n")
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def bench_git_metadata(args) -> int:
+    module = load_checker()
+
+    class SubprocessOnlyReader(module.GitMetadataReader):
+        def read_version(self, repo_path):
+            raise module.UnsupportedGitLayout("benchmark baseline")
+
+        def read_remote_url(self, repo_path, remote="origin"):
+            raise module.UnsupportedGitLayout("benchmark baseline")
+
+    root = Path(tempfile.mkdtemp(prefix="asw-bench-"))
+    try:
+        print(f"Generating {args.repos} repositories under {root} ...")
+        _, generate_time = timed(lambda: generate_tree(root, args.repos))
+        print(f"  done in {generate_time:.1f}s")
+        print()
+
+        baseline = module.ASWVersionChecker(check_vps=False, workers=1)
+        baseline.asw_root = root
+        baseline.git_reader = SubprocessOnlyReader()
+
+        fast = module.ASWVersionChecker(check_vps=False, workers=1)
+        fast.asw_root = root
+
+        def rglob_discovery():
+            # The previous find_project_repos: full rglob plus a git subprocess per repo
+            return [git_dir.parent for git_dir in (root / "projects").rglob(".git")
+                    if git_dir.is_dir() and baseline.get_git_remote(git_dir.parent)]
+
+        old_repos, old_discovery = timed(rglob_discovery)
+        new_repos, new_discovery = timed(lambda: fast.find_project_repos(root / "projects"))
+        assert sorted(map(str, old_repos)) == sorted(repo.path for repo in new_repos)
+
+        paths = [repo.path for repo in new_repos]
+        old_versions, old_metadata = timed(lambda: [baseline.get_local_version(path) for path in paths])
+        new_versions, new_metadata = timed(lambda: [fast.get_local_version(path) for path in paths])
+        assert old_versions == new_versions, "file reader disagrees with git"
+
+        rows = [
+            ("discovery + origin URL", old_discovery, new_discovery),
+            ("HEAD/branch/date", old_metadata, new_metadata),
+            ("total", old_discovery + old_metadata, new_discovery + new_metadata),
+        ]
+        print(f"{'Stage':<24} {'git subprocess':>15} {'file reader':>12} {'speedup':>9}")
+        for stage, old, new in rows:
+            print(f"{stage:<24} {old:>14.3f}s {new:>11.3f}s {old / new:>8.1f}x")
+        print()
+        print(f"{len(paths)} repositories, results identical")
+        return 0
+    finally:
+        if args.keep:
+            print(f"Kept benchmark tree at {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def time_to_first_output(cmd, env):
+    """Run cmd and return (seconds until its first stdout byte, total seconds)"""
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    proc.stdout.read(1)
+    first = time.perf_counter() - started
+    proc.stdout.read()
+    proc.wait()
+    return first, time.perf_counter() - started
+
+
+def bench_startup(args) -> int:
+    root = Path(tempfile.mkdtemp(prefix="asw-bench-"))
+    try:
+        print(f"Generating {args.repos} repositories under {root} ...")
+        generate_tree(root, args.repos)
+        print()
+
+        env = dict(os.environ, XDG_CACHE_HOME=str(root / "cache"), ASW_ROOT=str(root))
+        checker = [sys.executable, str(CHECKER_PATH), "--no-vps", "--no-github"]
+        scenarios = [
+            ("interpreter only", [sys.executable, "-c", "print()"]),
+            ("eager dependency imports", [sys.executable, "-c", "import requests, tabulate, colorama; print()"]),
+            ("table, cold repo cache", checker + ["--refresh"]),
+            ("table, warm repo cache", checker),
+            ("--json, warm repo cache", checker + ["--json"]),
+        ]
+        if args.baseline:
+            # Older versions always check /opt/asw, so only their time to the banner is comparable
+            scenarios.append(("baseline banner", [sys.executable, str(args.baseline), "--no-vps"]))
+
+        # Populate the repository cache for the warm scenarios
+        subprocess.run(checker + ["--json"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        print(f"{'Scenario':<26} {'first output':>13} {'total':>9}   (median of {args.runs} runs)")
+        for name, cmd in scenarios:
+            samples = [time_to_first_output(cmd, env) for _ in range(args.runs)]
+            first = statistics.median(sample[0] for sample in samples)
+            total = statistics.median(sample[1] for sample in samples)
+            print(f"{name:<26} {first * 1000:>11.1f}ms {total * 1000:>7.1f}ms")
+        print()
+        print("The table banner is printed before discovery, so its first output is import-bound;")
+        print("--json prints nothing until the results are ready.")
+        return 0
+    finally:
+        if args.keep:
+            print(f"Kept benchmark tree at {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for asw-check-version")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    git_metadata = subparsers.add_parser("git-metadata", help="File reader vs git subprocesses")
+    git_metadata.add_argument("--repos", type=int, default=200, help="Repositories to generate (default: 200)")
+    git_metadata.add_argument("--keep", action="store_true", help="Keep the generated tree")
+    git_metadata.set_defaults(func=bench_git_metadata)
+
+    startup = subparsers.add_parser("startup", help="Time to first output of asw-check-version")
+    startup.add_argument("--repos", type=int, default=50, help="Repositories to generate (default: 50)")
+    startup.add_argument("--runs", type=int, default=10, help="Runs per scenario (default: 10)")
+    startup.add_argument("--baseline", type=Path, metavar="OLD_SCRIPT",
+                         help="Also time an older asw-check-version, e.g. from `git show REV:scripts/asw-check-version`")
+    startup.add_argument("--keep", action="store_true", help="Keep the generated tree")
+    startup.set_defaults(func=bench_startup)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,14 @@ NC='\033[0m' # No Color
 # Script directory
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
+# Parallel mode: hand off to the dependency-aware runner, which runs the checks
+# declared in phase-checks/*.checks concurrently and can write JSON/JUnit reports.
+#   ./check-all-phases.sh --parallel [--workers N] [--json FILE] [--junit FILE]
+if [[ "${1:-}" == "--parallel" ]]; then
+    shift
+    exec python3 "$SCRIPT_DIR/asw-phase-runner" "$@"
+fi
+
 # Phase tracking
 PHASES_PASSED=0
 PHASES_FAILED=0
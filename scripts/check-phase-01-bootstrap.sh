@@ -2,6 +2,10 @@
 # check-bootstrap.sh
 # Validates Phase 1: Bootstrap setup according to COMPLETE-AUTOMATION-ARCHITECTURE.md
 # Can be run locally on target server or remotely via SSH
+#
+# phase-checks/01-bootstrap.checks declares the same checks for asw-phase-runner
+# (check-all-phases.sh --parallel). Keep the two in sync by hand: a check added,
+# removed or changed between pass/warn/fail here needs the same change there.
 
 # Removed set -e to prevent hanging on conditional checks
 
@@ -2,6 +2,10 @@
 # check-dev-environment.sh
 # Validates Phase 3: Development Environment according to COMPLETE-AUTOMATION-ARCHITECTURE.md
 # Can be run locally on target server or remotely via SSH
+#
+# phase-checks/03-dev-environment.checks declares the same checks for asw-phase-runner
+# (check-all-phases.sh --parallel). Keep the two in sync by hand: a check added,
+# removed or changed between pass/warn/fail here needs the same change there.
 
 # Removed set -e to prevent hanging on conditional checks
 
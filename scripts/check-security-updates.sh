@@ -1,72 +1,516 @@
 #!/bin/bash
-# Automated Security Library Update Checker
-# Run this weekly via cron to check for updates
+# Automated Security Update Checker
+# Run this via cron to check for security updates
+#
+# Each run stores what it saw in a state file (sorted key=value lines) and only
+# re-examines what changed since the previous run:
+#   - installed packages: re-read only when the dpkg/apt databases changed
+#   - project lockfiles: only changed lockfiles are re-audited (npm/yarn/pnpm/pip-audit)
+#   - auth log: only lines appended since the last run are parsed (rotation aware)
+#   - security library: the check re-runs only when the library or an installed copy changed
+# and prints a delta report against the previous run.
+#
+# Usage: check-security-updates.sh [--full] [--no-pull] [--state FILE]
+#   --full          Ignore the saved state and rescan everything (state is still updated)
+#   --no-pull       Don't `git pull` the security repository first
+#   --state FILE    State file (default: $ASW_ROOT/logs/security-scan.state)
+#
+# Exit codes: 0 = nothing needs attention, 1 = updates or high/critical vulnerabilities
 
 set -euo pipefail
 
-SECURITY_REPO="/opt/asw/agentic-framework-security"
-REPOS_BASE="/opt/asw"
+REPOS_BASE="${ASW_ROOT:-/opt/asw}"
+SECURITY_REPO="$REPOS_BASE/agentic-framework-security"
+PROJECTS_DIR="$REPOS_BASE/projects"
 NOTIFICATION_EMAIL="admin@yourdomain.com"
-LOG_FILE="/opt/asw/logs/security-updates.log"
+LOG_FILE="$REPOS_BASE/logs/security-updates.log"
+STATE_FILE="${ASW_SECURITY_STATE:-$REPOS_BASE/logs/security-scan.state}"
+AUTH_LOG="${AUTH_LOG:-/var/log/auth.log}"
+DPKG_STATUS="/var/lib/dpkg/status"
+APT_LISTS="/var/lib/apt/lists"
 
 # Colors
 GREEN='\033[0;32m'
 YELLOW='\033[1;33m'
 RED='\033[0;31m'
+BLUE='\033[0;34m'
 NC='\033[0m'
 
+FULL=""
+NO_PULL=""
+
+while [[ $# -gt 0 ]]; do
+    case $1 in
+        --full)
+            FULL=1
+            shift
+            ;;
+        --no-pull)
+            NO_PULL=1
+            shift
+            ;;
+        --state)
+            STATE_FILE="$2"
+            shift 2
+            ;;
+        -h|--help)
+            sed -n '2,19p' "$0" | sed 's/^# \{0,1\}//'
+            exit 0
+            ;;
+        *)
+            echo -e "${RED}Unknown option: $1${NC}" >&2
+            exit 2
+            ;;
+    esac
+done
+
+# STATE holds the previous run, NEXT is what this run will save
+declare -A STATE
+declare -A NEXT
+REPORT=()
+NEEDS_ATTENTION=0
+CHANGED=0
+
 log_message() {
     echo "[$(date +'%Y-%m-%d %H:%M:%S')] $1" | tee -a "$LOG_FILE"
 }
 
+report() {
+    REPORT+=("$1")
+}
+
+load_state() {
+    local line
+    [[ -r "$STATE_FILE" ]] || return 0
+    while IFS= read -r line; do
+        [[ "$line" == *=* ]] || continue
+        STATE[${line%%=*}]=${line#*=}
+    done < "$STATE_FILE"
+}
+
+save_state() {
+    local key tmp
+    tmp=$(mktemp "$STATE_FILE.XXXXXX")
+    for key in "${!NEXT[@]}"; do
+        printf '%s=%s\n' "$key" "${NEXT[$key]}"
+    done | sort > "$tmp"
+    mv "$tmp" "$STATE_FILE"
+}
+
+# Copy every previous-state key with the given prefix into NEXT
+carry_state() {
+    local prefix=$1 key
+    for key in "${!STATE[@]}"; do
+        [[ "$key" == "$prefix"* ]] && NEXT[$key]=${STATE[$key]}
+    done
+    return 0
+}
+
+# " (was OLD)" when a previous value exists and differs
+was() {
+    [[ -n "$1" && "$1" != "$2" ]] && echo " (was $1)"
+    return 0
+}
+
+# Stamp for a file or directory: mtime:size, or "missing"
+stamp() {
+    stat -c '%Y:%s' "$1" 2>/dev/null || echo "missing"
+}
+
+# --- Installed packages ------------------------------------------------------
+
+scan_packages() {
+    local dpkg_stamp apt_stamp name version old
+    local upgraded=0 added=0 removed=0 details=()
+
+    if ! command -v dpkg-query >/dev/null 2>&1; then
+        report "Packages: dpkg not available, skipped"
+        return 0
+    fi
+
+    dpkg_stamp=$(stamp "$DPKG_STATUS")
+    if [[ -z "$FULL" && "${STATE[dpkg.stamp]:-}" == "$dpkg_stamp" ]]; then
+        carry_state "pkg."
+        NEXT[dpkg.stamp]=$dpkg_stamp
+        report "Packages: unchanged since last run"
+    else
+        declare -A seen
+        while IFS=$'\t' read -r name version; do
+            seen[$name]=1
+            NEXT[pkg.$name]=$version
+            old=${STATE[pkg.$name]:-}
+            [[ -n "${STATE[dpkg.stamp]:-}" ]] || continue
+            if [[ -z "$old" ]]; then
+                added=$((added + 1))
+                details+=("  + $name $version")
+            elif [[ "$old" != "$version" ]]; then
+                upgraded=$((upgraded + 1))
+                details+=("  ~ $name $old -> $version")
+            fi
+        done < <(dpkg-query -W -f '${db:Status-Abbrev}\t${Package}\t${Version}\n' 2>/dev/null \
+                 | awk -F'\t' '$1 ~ /^ii/ { print $2 "\t" $3 }')
+
+        if [[ -n "${STATE[dpkg.stamp]:-}" ]]; then
+            for name in "${!STATE[@]}"; do
+                [[ "$name" == pkg.* && -z "${seen[${name#pkg.}]:-}" ]] || continue
+                removed=$((removed + 1))
+                details+=("  - ${name#pkg.} ${STATE[$name]}")
+            done
+            report "Packages: $upgraded changed, $added added, $removed removed"
+            if [[ ${#details[@]} -gt 0 ]]; then
+                CHANGED=1
+                mapfile -t -O "${#REPORT[@]}" REPORT < <(printf '%s\n' "${details[@]}" | sort -k2)
+            fi
+        else
+            report "Packages: baseline recorded (${#seen[@]} installed)"
+        fi
+        NEXT[dpkg.stamp]=$dpkg_stamp
+    fi
+
+    # Pending security updates only change with the package database or the apt lists
+    apt_stamp="$dpkg_stamp/$(stamp "$APT_LISTS")"
+    if [[ -z "$FULL" && "${STATE[apt.stamp]:-}" == "$apt_stamp" && -n "${STATE[apt.security_pending]:-}" ]]; then
+        NEXT[apt.security_pending]=${STATE[apt.security_pending]}
+    else
+        NEXT[apt.security_pending]=$(apt-get -s upgrade 2>/dev/null | grep -c '^Inst.*-security' || true)
+    fi
+    NEXT[apt.stamp]=$apt_stamp
+
+    old=${STATE[apt.security_pending]:-}
+    if [[ "${NEXT[apt.security_pending]}" -gt 0 ]]; then
+        NEEDS_ATTENTION=1
+        report "${YELLOW}Pending security updates: ${NEXT[apt.security_pending]}$(was "$old" "${NEXT[apt.security_pending]}")${NC}"
+    else
+        report "${GREEN}Pending security updates: 0$(was "$old" 0)${NC}"
+    fi
+    [[ "$old" == "${NEXT[apt.security_pending]}" ]] || CHANGED=1
+}
+
+# --- Project lockfiles -------------------------------------------------------
+
+# Summarise npm/yarn/pnpm/pip-audit JSON on stdin as critical:high:moderate:low:unknown
+audit_counts() {
+    python3 -c '
+import json, sys
+text = sys.stdin.read()
+try:
+    docs = [json.loads(text)]
+except ValueError:
+    # yarn audit --json prints one JSON object per line
+    docs = [json.loads(line) for line in text.splitlines() if line.startswith("{")]
+levels = ("critical", "high", "moderate", "low", "unknown")
+counts = dict.fromkeys(levels, 0)
+parsed = False
+for doc in docs:
+    if doc.get("type") == "auditSummary":
+        doc = doc.get("data", {})
+    vulns = doc.get("metadata", {}).get("vulnerabilities")
+    if vulns is None and doc.get("type") is None and "advisories" not in doc:
+        vulns = doc.get("vulnerabilities")
+    if isinstance(vulns, dict) and all(isinstance(v, int) for v in vulns.values()):
+        parsed = True
+        for level, count in vulns.items():
+            if level in counts:
+                counts[level] += count
+            elif level == "info":
+                counts["low"] += count
+    if isinstance(doc.get("dependencies"), list):  # pip-audit has no severities
+        parsed = True
+        counts["unknown"] += sum(len(dep.get("vulns", [])) for dep in doc["dependencies"])
+if not parsed:
+    sys.exit(1)
+print(":".join(str(counts[level]) for level in levels))
+'
+}
+
+# Audit one lockfile; prints counts, or returns 1 if it couldn't be audited
+audit_lockfile() {
+    local lockfile=$1 dir tool
+    dir=$(dirname "$lockfile")
+    case $(basename "$lockfile") in
+        package-lock.json|npm-shrinkwrap.json) tool=(npm audit --json --package-lock-only) ;;
+        yarn.lock) tool=(yarn audit --json) ;;
+        pnpm-lock.yaml) tool=(pnpm audit --json) ;;
+        requirements.txt) tool=(pip-audit -r requirements.txt -f json --progress-spinner off) ;;
+        *) return 1 ;;
+    esac
+    command -v "${tool[0]}" >/dev/null 2>&1 || return 1
+    # Audit tools exit non-zero when they find vulnerabilities, so only the output counts
+    (cd "$dir" && "${tool[@]}" 2>/dev/null || true) | audit_counts
+}
+
+# "2 critical, 1 high" style summary of critical:high:moderate:low:unknown
+format_counts() {
+    local critical high moderate low unknown parts=()
+    IFS=: read -r critical high moderate low unknown <<< "$1"
+    [[ "$critical" -gt 0 ]] && parts+=("$critical critical")
+    [[ "$high" -gt 0 ]] && parts+=("$high high")
+    [[ "$moderate" -gt 0 ]] && parts+=("$moderate moderate")
+    [[ "$low" -gt 0 ]] && parts+=("$low low")
+    [[ "$unknown" -gt 0 ]] && parts+=("$unknown unrated")
+    if [[ ${#parts[@]} -eq 0 ]]; then
+        echo "no vulnerabilities"
+    else
+        local IFS=,
+        echo "${parts[*]}" | sed 's/,/, /g'
+    fi
+}
+
+scan_lockfiles() {
+    local rel mtime size stat_key sha counts old line critical high
+    local total=0 unchanged=0 audited=0 failed=0 removed=0 vulnerable=0
+    declare -A seen
+
+    if [[ ! -d "$PROJECTS_DIR" ]]; then
+        report "Projects: $PROJECTS_DIR not found, skipped"
+        return 0
+    fi
+
+    # One pruned walk with mtime and size, so unchanged lockfiles are never read
+    while IFS=$'\t' read -r rel mtime size; do
+        total=$((total + 1))
+        seen[$rel]=1
+        stat_key="$mtime:$size"
+        old=${STATE[audit.$rel]:-}
+
+        if [[ -z "$FULL" && -n "$old" && "${STATE[lock.$rel.stat]:-}" == "$stat_key" ]]; then
+            unchanged=$((unchanged + 1))
+        else
+            sha=$(sha256sum "$PROJECTS_DIR/$rel" | cut -d' ' -f1)
+            if [[ -z "$FULL" && -n "$old" && "${STATE[lock.$rel.sha256]:-}" == "$sha" ]]; then
+                # Touched but identical content
+                unchanged=$((unchanged + 1))
+            elif counts=$(audit_lockfile "$PROJECTS_DIR/$rel"); then
+                audited=$((audited + 1))
+                line="  $rel: $(format_counts "$counts")"
+                [[ -n "$old" && "$old" != "$counts" ]] && line+=" (was $(format_counts "$old"))"
+                [[ -z "$old" ]] && line+=" (new)"
+                report "$line"
+                [[ "$old" == "$counts" ]] || CHANGED=1
+                NEXT[lock.$rel.stat]=$stat_key
+                NEXT[lock.$rel.sha256]=$sha
+                NEXT[audit.$rel]=$counts
+            else
+                # Not recorded, so it is retried next run (e.g. once the audit tool is installed)
+                failed=$((failed + 1))
+                report "  ${YELLOW}$rel: could not be audited${NC}"
+                [[ -n "$old" ]] && NEXT[audit.$rel]=$old
+            fi
+        fi
+
+        if [[ -z "${NEXT[audit.$rel]:-}" && -n "$old" ]]; then
+            NEXT[lock.$rel.stat]=$stat_key
+            NEXT[lock.$rel.sha256]=${STATE[lock.$rel.sha256]:-}
+            NEXT[audit.$rel]=$old
+        fi
+        IFS=: read -r critical high _ <<< "${NEXT[audit.$rel]:-0:0}"
+        [[ $((critical + high)) -gt 0 ]] && vulnerable=$((vulnerable + 1))
+    done < <(find "$PROJECTS_DIR" \( -name node_modules -o -name .git -o -name venv -o -name .venv \) -prune \
+                 -o -type f \( -name package-lock.json -o -name npm-shrinkwrap.json -o -name yarn.lock \
+                 -o -name pnpm-lock.yaml -o -name requirements.txt \) -printf '%P\t%T@\t%s\n' | sort)
+
+    for rel in "${!STATE[@]}"; do
+        [[ "$rel" == audit.* && -z "${seen[${rel#audit.}]:-}" ]] || continue
+        removed=$((removed + 1))
+        CHANGED=1
+        report "  $rel: lockfile removed"
+    done
+
+    report "Projects: $total lockfiles, $audited re-audited, $unchanged unchanged (cached), $failed not auditable, $removed removed"
+    if [[ $vulnerable -gt 0 ]]; then
+        NEEDS_ATTENTION=1
+        report "${RED}Projects with high/critical vulnerabilities: $vulnerable${NC}"
+    fi
+}
+
+# --- Auth log ----------------------------------------------------------------
+
+# Count events in auth log lines on stdin: lines failed invalid accepted root unique_ips top_ips
+count_auth_events() {
+    awk '
+        { lines++ }
+        /Failed password/ {
+            failed++
+            for (i = 1; i < NF; i++) if ($i == "from") { ips[$(i + 1)]++; break }
+        }
+        /Invalid user/ { invalid++ }
+        /Accepted (password|publickey)/ { accepted++ }
+        /(Failed password|Accepted [a-z]+) for root / { root++ }
+        END {
+            unique = 0
+            for (ip in ips) unique++
+            top = ""
+            for (n = 0; n < 3; n++) {
+                best = ""
+                for (ip in ips) if (best == "" || ips[ip] > ips[best]) best = ip
+                if (best == "") break
+                top = top (top == "" ? "" : ",") best "(" ips[best] ")"
+                delete ips[best]
+            }
+            printf "%d %d %d %d %d %d %s\n", lines, failed, invalid, accepted, root, unique, (top == "" ? "-" : top)
+        }
+    '
+}
+
+scan_auth_log() {
+    local inode size offset old_inode rotated="" lines failed invalid accepted root unique top
+
+    if [[ ! -r "$AUTH_LOG" ]]; then
+        carry_state "authlog."
+        report "Auth log: $AUTH_LOG not readable, skipped"
+        return 0
+    fi
+
+    inode=$(stat -c '%i' "$AUTH_LOG")
+    size=$(stat -c '%s' "$AUTH_LOG")
+    old_inode=${STATE[authlog.inode]:-}
+    offset=${STATE[authlog.offset]:-0}
+    [[ -n "$FULL" ]] && old_inode="" offset=0
+
+    if [[ -n "$old_inode" && "$old_inode" != "$inode" ]]; then
+        # Rotated: finish the old file if it's still around, then read the new one from the start
+        if [[ -e "$AUTH_LOG.1" && "$(stat -c '%i' "$AUTH_LOG.1")" == "$old_inode" ]]; then
+            rotated="$AUTH_LOG.1"
+        fi
+    elif [[ "$size" -lt "$offset" ]]; then
+        # Truncated in place
+        offset=0
+    fi
+
+    # Bound each read by the size seen now so lines appended meanwhile are picked up next run
+    read -r lines failed invalid accepted root unique top < <(
+        {
+            if [[ -n "$rotated" ]]; then
+                tail -c +$((offset + 1)) "$rotated"
+            fi
+            if [[ -n "$old_inode" && "$old_inode" != "$inode" ]]; then
+                head -c "$size" "$AUTH_LOG"
+            else
+                tail -c +$((offset + 1)) "$AUTH_LOG" | head -c $((size - offset))
+            fi
+        } | count_auth_events
+    )
+
+    NEXT[authlog.inode]=$inode
+    NEXT[authlog.offset]=$size
+
+    local since="since last run"
+    [[ -z "$old_inode" ]] && since="baseline, whole log"
+    report "Auth log ($since${rotated:+, rotated}): $lines new lines, $failed failed passwords from $unique IPs, $invalid invalid users, $accepted accepted logins"
+    [[ "$lines" -gt 0 ]] && CHANGED=1
+    if [[ "$failed" -gt 0 ]]; then
+        report "  Top failed-login sources: ${top//,/, }"
+    fi
+    if [[ "$root" -gt 0 ]]; then
+        NEEDS_ATTENTION=1
+        report "${RED}  Root login attempts: $root${NC}"
+    fi
+}
+
+# --- Security library --------------------------------------------------------
+
+check_security_library() {
+    local head installed fingerprint output old
+
+    if [[ ! -x "$SECURITY_REPO/update-security-library.sh" ]]; then
+        report "Security library: $SECURITY_REPO not installed, skipped"
+        return 0
+    fi
+
+    if [[ -z "$NO_PULL" ]]; then
+        log_message "Pulling latest security repository..."
+        git -C "$SECURITY_REPO" pull origin main >> "$LOG_FILE" 2>&1 || log_message "git pull failed, checking current checkout"
+    fi
+
+    # The check only needs re-running when the library or one of its installed copies changed
+    head=$(git -C "$SECURITY_REPO" rev-parse HEAD 2>/dev/null || true)
+    installed=$(find "$REPOS_BASE"/agentic-framework-*/lib/security -type f -printf '%p %T@ %s\n' 2>/dev/null \
+                | sort | sha256sum | cut -c1-16)
+    fingerprint="$head:$installed"
+    old=${STATE[library.updates]:-}
+
+    if [[ -z "$FULL" && -n "$old" && "${STATE[library.fingerprint]:-}" == "$fingerprint" ]]; then
+        NEXT[library.updates]=$old
+        report "Security library: unchanged since last check"
+    else
+        log_message "Checking for outdated security libraries..."
+        output=$("$SECURITY_REPO/update-security-library.sh" check 2>&1 || true)
+        echo "$output" >> "$LOG_FILE"
+        if echo "$output" | grep -q "Update available\|not installed"; then
+            NEXT[library.updates]=yes
+        else
+            NEXT[library.updates]=no
+        fi
+        report "Security library: re-checked${head:+ at ${head:0:8}}"
+        [[ "$old" == "${NEXT[library.updates]}" ]] || CHANGED=1
+    fi
+    NEXT[library.fingerprint]=$fingerprint
+
+    if [[ "${NEXT[library.updates]}" == "yes" ]]; then
+        NEEDS_ATTENTION=1
+        report "${YELLOW}⚠ Security library updates are available${NC}"
+        report "  Run: $SECURITY_REPO/update-security-library.sh update"
+
+        # Optionally auto-update (uncomment if desired)
+        # log_message "Auto-updating all repositories..."
+        # "$SECURITY_REPO/update-security-library.sh" update >> "$LOG_FILE" 2>&1
+        #
+        # # Auto-commit updates (be careful with this!)
+        # for repo in agentic-framework-infrastructure agentic-framework-core agentic-framework-dev; do
+        #     if [[ -d "$REPOS_BASE/$repo" ]]; then
+        #         cd "$REPOS_BASE/$repo"
+        #         if git diff --quiet lib/security/; then
+        #             log_message "No changes in $repo"
+        #         else
+        #             git add lib/security/
+        #             git commit -m "chore: Update security library to latest version [automated]"
+        #             git push
+        #             log_message "Updated and pushed $repo"
+        #         fi
+        #     fi
+        # done
+    else
+        report "${GREEN}✓ All security libraries are up to date${NC}"
+    fi
+}
+
+# --- Main --------------------------------------------------------------------
+
 # Create log directory if needed
-mkdir -p "$(dirname "$LOG_FILE")"
-
-log_message "=== Starting Security Library Update Check ==="
-
-# Update security repo
-log_message "Pulling latest security repository..."
-cd "$SECURITY_REPO"
-git pull origin main >> "$LOG_FILE" 2>&1
-
-# Check for updates
-log_message "Checking for outdated security libraries..."
-UPDATE_CHECK=$("$SECURITY_REPO/update-security-library.sh" check 2>&1)
-echo "$UPDATE_CHECK" | tee -a "$LOG_FILE"
-
-# Check if updates are needed
-if echo "$UPDATE_CHECK" | grep -q "Update available\|not installed"; then
-    log_message "Updates are available!"
-    
-    # Send notification (optional)
-    if command -v mail >/dev/null 2>&1; then
-        echo "$UPDATE_CHECK" | mail -s "Security Library Updates Available" "$NOTIFICATION_EMAIL"
-    fi
-    
-    # Optionally auto-update (uncomment if desired)
-    # log_message "Auto-updating all repositories..."
-    # "$SECURITY_REPO/update-security-library.sh" update >> "$LOG_FILE" 2>&1
-    # 
-    # # Auto-commit updates (be careful with this!)
-    # for repo in agentic-framework-infrastructure agentic-framework-core agentic-framework-dev; do
-    #     if [[ -d "$REPOS_BASE/$repo" ]]; then
-    #         cd "$REPOS_BASE/$repo"
-    #         if git diff --quiet lib/security/; then
-    #             log_message "No changes in $repo"
-    #         else
-    #             git add lib/security/
-    #             git commit -m "chore: Update security library to latest version [automated]"
-    #             git push
-    #             log_message "Updated and pushed $repo"
-    #         fi
-    #     fi
-    # done
-    
-    echo -e "${YELLOW}⚠ Security library updates are available${NC}"
-    echo "Run: $SECURITY_REPO/update-security-library.sh update"
-    exit 1
+mkdir -p "$(dirname "$LOG_FILE")" "$(dirname "$STATE_FILE")"
+
+log_message "=== Starting Security Update Check ==="
+
+[[ -z "$FULL" ]] && load_state
+PREVIOUS_RUN=${STATE[run.time]:-}
+NEXT[run.time]=$(date +'%Y-%m-%d %H:%M:%S')
+
+check_security_library
+scan_packages
+scan_lockfiles
+scan_auth_log
+
+save_state
+
+if [[ -n "$PREVIOUS_RUN" ]]; then
+    REPORT=("${BLUE}=== Security delta since $PREVIOUS_RUN ===${NC}" "${REPORT[@]}")
 else
-    log_message "All security libraries are up to date"
-    echo -e "${GREEN}✓ All security libraries are up to date${NC}"
-    exit 0
-fi
\ No newline at end of file
+    REPORT=("${BLUE}=== Security baseline ===${NC}" "${REPORT[@]}")
+fi
+echo ""
+printf '%b\n' "${REPORT[@]}"
+printf '%b\n' "${REPORT[@]}" | sed 's/\x1b\[[0-9;]*m//g' >> "$LOG_FILE"
+
+if [[ $NEEDS_ATTENTION -eq 1 ]]; then
+    log_message "Security updates or vulnerabilities need attention"
+
+    # Send notification (optional), only when something changed since the last run
+    if [[ $CHANGED -eq 1 ]] && command -v mail >/dev/null 2>&1; then
+        printf '%b\n' "${REPORT[@]}" | sed 's/\x1b\[[0-9;]*m//g' \
+            | mail -s "Security Updates Need Attention" "$NOTIFICATION_EMAIL"
+    fi
+    exit 1
+fi
+
+log_message "Nothing needs attention"
+exit 0
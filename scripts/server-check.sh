@@ -1,6 +1,15 @@
 #!/bin/bash
 # Server Setup Verification Script
 # Checks all components installed by the complete server setup
+#
+# System state is gathered once into an in-memory fact map (packages, services,
+# sshd config, UFW rules, users, tool versions, paths) and every check is
+# answered from that snapshot.
+#
+# Usage: server-check.sh [--save-facts FILE] [--from-facts FILE]
+#   --save-facts FILE   Also write the collected facts to FILE (sorted key=value lines)
+#   --from-facts FILE   Skip collection and check a previously saved snapshot
+#                       (e.g. from another server, or to re-run checks offline)
 
 # Colors for output
 GREEN='\033[0;32m'
@@ -17,6 +26,186 @@ CROSS="✗"
 INFO="ℹ"
 WARN="⚠"
 
+SAVE_FACTS=""
+FROM_FACTS=""
+
+while [[ $# -gt 0 ]]; do
+    case $1 in
+        --save-facts)
+            SAVE_FACTS="$2"
+            shift 2
+            ;;
+        --from-facts)
+            FROM_FACTS="$2"
+            shift 2
+            ;;
+        -h|--help)
+            sed -n '2,13p' "$0" | sed 's/^# \{0,1\}//'
+            exit 0
+            ;;
+        *)
+            echo -e "${RED}Unknown option: $1${NC}" >&2
+            exit 2
+            ;;
+    esac
+done
+
+# Fact snapshot: key -> value
+declare -A FACTS
+
+PACKAGES=("sudo" "curl" "git" "wget" "htop" "vim" "nano" "build-essential" "ufw" "fail2ban")
+SERVICES=("ssh" "fail2ban")
+FRAMEWORKS=("agentic-framework-core" "agentic-framework-dev" "agentic-framework-infrastructure" "agentic-framework-security")
+CHECKED_PATHS=(
+    "/home/cc-user"
+    "/home/cc-user/.ssh"
+    "/etc/ssh/sshd_config.d"
+    "/etc/ssh/sshd_config.d/99-hardening.conf"
+    "/opt/asw"
+)
+HARDENING_CONF="/etc/ssh/sshd_config.d/99-hardening.conf"
+AUTHORIZED_KEYS="/home/cc-user/.ssh/authorized_keys"
+
+# Function to gather all system facts in one pass
+collect_facts() {
+    local line key name status version state i
+
+    # System information
+    FACTS[sys.hostname]=$(hostname)
+    FACTS[sys.kernel]=$(uname -r)
+    FACTS[sys.arch]=$(uname -m)
+    FACTS[sys.os]=$(lsb_release -ds 2>/dev/null || grep PRETTY_NAME /etc/os-release | cut -d'"' -f2)
+    FACTS[sys.uptime]=$(uptime -p 2>/dev/null)
+    FACTS[sys.ip]=$(hostname -I 2>/dev/null | awk '{print $1}')
+    FACTS[sys.collected_at]=$(date +'%Y-%m-%d %H:%M:%S')
+
+    # APT state
+    compgen -G "/var/lib/apt/lists/*.*" >/dev/null && FACTS[apt.lists]="present"
+    FACTS[apt.upgradable]=$(apt list --upgradable 2>/dev/null | grep -c upgradable)
+    FACTS[apt.last_update]=$(stat -c %y /var/lib/apt/periodic/update-success-stamp 2>/dev/null || echo 'Never')
+
+    # Every installed package and its version, from a single dpkg-query
+    while IFS=$'\t' read -r name status version; do
+        [[ "$status" == "install ok installed" ]] && FACTS[pkg.$name]="$version"
+    done < <(dpkg-query -W -f='${Package}\t${Status}\t${Version}\n' 2>/dev/null)
+
+    # Service state, one systemctl call for all units
+    i=0
+    while IFS= read -r state; do
+        FACTS[svc.${SERVICES[$i]}]="$state"
+        i=$((i + 1))
+    done < <(systemctl is-active "${SERVICES[@]}" 2>/dev/null)
+
+    # User and group information
+    if line=$(getent passwd cc-user); then
+        IFS=: read -r _ _ FACTS[user.cc-user.uid] _ _ FACTS[user.cc-user.home] FACTS[user.cc-user.shell] <<< "$line"
+        FACTS[user.cc-user.groups]=$(id -nG cc-user 2>/dev/null)
+    fi
+    grep -q '^cc-user\|^%sudo' /etc/sudoers /etc/sudoers.d/* 2>/dev/null && FACTS[user.cc-user.sudo]="yes"
+
+    # sshd: hardening file settings (first occurrence wins, as in sshd), configured port
+    # and, when readable, the effective configuration
+    if [[ -r "$HARDENING_CONF" ]]; then
+        while IFS= read -r line; do
+            [[ -z "$line" || "$line" == \#* ]] && continue
+            key=${line%%[[:space:]]*}
+            [[ -z "${FACTS[sshd.hardening.$key]+set}" ]] && FACTS[sshd.hardening.$key]="$line"
+        done < "$HARDENING_CONF"
+    fi
+    FACTS[sshd.port]=$(awk '/^Port/ {print $2; exit}' /etc/ssh/sshd_config /etc/ssh/sshd_config.d/* 2>/dev/null)
+    while read -r key line; do
+        [[ -n "$key" ]] && FACTS[sshd.effective.$key]="$line"
+    done < <(sudo -n sshd -T 2>/dev/null)
+
+    # SSH keys: one ssh-keygen call fingerprints the whole file
+    if [[ -f "$AUTHORIZED_KEYS" ]]; then
+        local -a key_types=() key_comments=() fingerprints=()
+        FACTS[ssh.keys.lines]=$(wc -l < "$AUTHORIZED_KEYS")
+        while IFS= read -r line; do
+            if [[ -n "$line" ]] && [[ ! "$line" =~ ^# ]]; then
+                read -r name _ version _ <<< "$line"
+                key_types+=("$name")
+                key_comments+=("$version")
+            fi
+        done < "$AUTHORIZED_KEYS"
+        mapfile -t fingerprints < <(ssh-keygen -lf "$AUTHORIZED_KEYS" 2>/dev/null | awk '{print $2}')
+        FACTS[ssh.keys.count]=${#key_types[@]}
+        for i in "${!key_types[@]}"; do
+            FACTS[ssh.key.$i]="${key_types[$i]}"$'\t'"${fingerprints[$i]}"$'\t'"${key_comments[$i]}"
+        done
+    fi
+
+    # Firewall rules, from one `ufw status numbered`
+    if command -v ufw >/dev/null 2>&1; then
+        FACTS[ufw.installed]="yes"
+        line=$(sudo ufw status numbered 2>/dev/null)
+        FACTS[ufw.status]=$(head -1 <<< "$line")
+        FACTS[ufw.rules]=$(grep -E "^\[" <<< "$line")
+    fi
+
+    # fail2ban jails
+    if [[ "${FACTS[svc.fail2ban]}" == "active" ]] && command -v fail2ban-client >/dev/null 2>&1; then
+        FACTS[fail2ban.jails]=$(sudo fail2ban-client status 2>/dev/null | grep "Jail list" | cut -d':' -f2 | xargs)
+    fi
+
+    # Development tool versions
+    command -v node >/dev/null 2>&1 && FACTS[tool.node]=$(node --version)
+    command -v npm >/dev/null 2>&1 && FACTS[tool.npm]=$(npm --version)
+    command -v op >/dev/null 2>&1 && FACTS[tool.op]=$(op --version)
+    command -v git >/dev/null 2>&1 && FACTS[tool.git]=$(git --version | cut -d' ' -f3)
+
+    # Paths: file size or directory item count
+    local -a items
+    shopt -s nullglob
+    for name in "${CHECKED_PATHS[@]}"; do
+        if [[ -f "$name" ]]; then
+            FACTS[path.$name]="file:$(ls -lh "$name" 2>/dev/null | awk '{print $5}')"
+        elif [[ -d "$name" ]]; then
+            items=("$name"/*)
+            FACTS[path.$name]="dir:${#items[@]}"
+        elif [[ -e "$name" ]]; then
+            FACTS[path.$name]="other"
+        fi
+    done
+
+    # ASW framework layout
+    if [[ -d /opt/asw ]]; then
+        for name in "${FRAMEWORKS[@]}"; do
+            [[ -d "/opt/asw/$name" ]] && FACTS[asw.$name.subdirs]=0
+        done
+        while IFS= read -r line; do
+            name=${line#/opt/asw/}
+            FACTS[asw.$name.subdirs]=$((${FACTS[asw.$name.subdirs]:-0} + 1))
+        done < <(find "${FRAMEWORKS[@]/#//opt/asw/}" -mindepth 1 -maxdepth 1 -type d -printf '%h\n' 2>/dev/null)
+        [[ -d /opt/asw/scripts ]] && items=(/opt/asw/scripts/*.sh) && FACTS[asw.scripts]=${#items[@]}
+        [[ -d /opt/asw/docs ]] && items=(/opt/asw/docs/*.md) && FACTS[asw.docs]=${#items[@]}
+    fi
+    shopt -u nullglob
+}
+
+# Function to write facts as sorted key=value lines (backslashes and newlines escaped)
+save_facts() {
+    local file=$1 key value
+    for key in "${!FACTS[@]}"; do
+        value=${FACTS[$key]//\\/\\\\}
+        value=${value//$'\n'/\\n}
+        printf '%s=%s\n' "$key" "$value"
+    done | sort > "$file"
+}
+
+# Function to load facts written by save_facts
+load_facts() {
+    local file=$1 line
+    if [[ ! -r "$file" ]]; then
+        echo -e "${RED}Cannot read facts file: $file${NC}" >&2
+        exit 2
+    fi
+    while IFS= read -r line; do
+        [[ "$line" == *=* ]] || continue
+        FACTS[${line%%=*}]=$(printf '%b' "${line#*=}")
+    done < "$file"
+}
+
 # Function to print section headers
 print_header() {
     echo ""
@@ -25,18 +214,13 @@ print_header() {
     echo -e "${BOLD}${BLUE}═══════════════════════════════════════════════════════════${NC}"
 }
 
-# Function to check status and print result
-check_status() {
+# Function to check a fact is present and print result
+check_fact() {
     local description=$1
-    local command=$2
-    local expected=$3
-    
-    if eval "$command" >/dev/null 2>&1; then
+    local key=$2
+
+    if [[ -n "${FACTS[$key]}" ]]; then
         echo -e "${GREEN}${CHECK}${NC} ${description}"
-        if [[ -n "$expected" ]]; then
-            local result=$(eval "$command" 2>/dev/null)
-            echo -e "  ${CYAN}└─${NC} ${result}"
-        fi
         return 0
     else
         echo -e "${RED}${CROSS}${NC} ${description}"
@@ -47,9 +231,8 @@ check_status() {
 # Function to check value
 check_value() {
     local description=$1
-    local command=$2
-    local result=$(eval "$command" 2>/dev/null)
-    
+    local result=$2
+
     if [[ -n "$result" ]]; then
         echo -e "${GREEN}${CHECK}${NC} ${description}"
         echo -e "  ${CYAN}└─${NC} ${result}"
@@ -64,13 +247,14 @@ check_value() {
 check_exists() {
     local description=$1
     local path=$2
-    
-    if [[ -e "$path" ]]; then
+    local state=${FACTS[path.$path]}
+
+    if [[ -n "$state" ]]; then
         echo -e "${GREEN}${CHECK}${NC} ${description}"
-        if [[ -f "$path" ]]; then
-            echo -e "  ${CYAN}└─${NC} Size: $(ls -lh "$path" 2>/dev/null | awk '{print $5}')"
-        elif [[ -d "$path" ]]; then
-            echo -e "  ${CYAN}└─${NC} Contents: $(ls -1 "$path" 2>/dev/null | wc -l) items"
+        if [[ "$state" == file:* ]]; then
+            echo -e "  ${CYAN}└─${NC} Size: ${state#file:}"
+        elif [[ "$state" == dir:* ]]; then
+            echo -e "  ${CYAN}└─${NC} Contents: ${state#dir:} items"
         fi
         return 0
     else
@@ -79,34 +263,46 @@ check_exists() {
     fi
 }
 
+# Gather facts
+if [[ -n "$FROM_FACTS" ]]; then
+    load_facts "$FROM_FACTS"
+else
+    collect_facts
+fi
+
+if [[ -n "$SAVE_FACTS" ]]; then
+    save_facts "$SAVE_FACTS"
+fi
+
 # Start checks
 echo ""
 echo -e "${BOLD}${CYAN}╔════════════════════════════════════════════════════════════╗${NC}"
 echo -e "${BOLD}${CYAN}║         VPS SERVER SETUP VERIFICATION REPORT              ║${NC}"
-echo -e "${BOLD}${CYAN}║                $(date +'%Y-%m-%d %H:%M:%S')                    ║${NC}"
+echo -e "${BOLD}${CYAN}║                ${FACTS[sys.collected_at]}                    ║${NC}"
 echo -e "${BOLD}${CYAN}╚════════════════════════════════════════════════════════════╝${NC}"
+if [[ -n "$FROM_FACTS" ]]; then
+    echo -e "${INFO} Checking saved facts: ${YELLOW}${FROM_FACTS}${NC}"
+fi
 
 # System Information
 print_header "1. SYSTEM INFORMATION"
-echo -e "${INFO} Hostname: ${YELLOW}$(hostname)${NC}"
-echo -e "${INFO} Kernel: ${YELLOW}$(uname -r)${NC}"
-echo -e "${INFO} OS: ${YELLOW}$(lsb_release -ds 2>/dev/null || cat /etc/os-release | grep PRETTY_NAME | cut -d'"' -f2)${NC}"
-echo -e "${INFO} Architecture: ${YELLOW}$(uname -m)${NC}"
-echo -e "${INFO} Uptime: ${YELLOW}$(uptime -p)${NC}"
+echo -e "${INFO} Hostname: ${YELLOW}${FACTS[sys.hostname]}${NC}"
+echo -e "${INFO} Kernel: ${YELLOW}${FACTS[sys.kernel]}${NC}"
+echo -e "${INFO} OS: ${YELLOW}${FACTS[sys.os]}${NC}"
+echo -e "${INFO} Architecture: ${YELLOW}${FACTS[sys.arch]}${NC}"
+echo -e "${INFO} Uptime: ${YELLOW}${FACTS[sys.uptime]}${NC}"
 
 # System Updates Status
 print_header "2. SYSTEM UPDATES"
-check_status "APT package lists updated" "ls -la /var/lib/apt/lists/*.* 2>/dev/null | head -1"
-check_value "Upgradable packages" "apt list --upgradable 2>/dev/null | grep -c upgradable || echo '0 packages can be upgraded'"
-check_value "Last update check" "stat -c %y /var/lib/apt/periodic/update-success-stamp 2>/dev/null || echo 'Never'"
+check_fact "APT package lists updated" "apt.lists"
+check_value "Upgradable packages" "${FACTS[apt.upgradable]:-0}"
+check_value "Last update check" "${FACTS[apt.last_update]}"
 
 # Essential Packages
 print_header "3. ESSENTIAL PACKAGES"
-packages=("sudo" "curl" "git" "wget" "htop" "vim" "nano" "build-essential" "ufw" "fail2ban")
-for pkg in "${packages[@]}"; do
-    if dpkg -l | grep -q "^ii.*$pkg"; then
-        version=$(dpkg -l | grep "^ii.*$pkg" | awk '{print $3}' | head -1)
-        echo -e "${GREEN}${CHECK}${NC} $pkg installed (${version})"
+for pkg in "${PACKAGES[@]}"; do
+    if [[ -n "${FACTS[pkg.$pkg]}" ]]; then
+        echo -e "${GREEN}${CHECK}${NC} $pkg installed (${FACTS[pkg.$pkg]})"
     else
         echo -e "${RED}${CROSS}${NC} $pkg not installed"
     fi
@@ -114,21 +310,21 @@ done
 
 # User Account
 print_header "4. USER ACCOUNT (cc-user)"
-check_status "User 'cc-user' exists" "id cc-user"
-check_value "User ID" "id -u cc-user"
-check_value "Groups" "groups cc-user 2>/dev/null | sed 's/cc-user : //'"
-check_status "Sudo privileges" "grep -q '^cc-user\|^%sudo' /etc/sudoers /etc/sudoers.d/* 2>/dev/null"
+check_fact "User 'cc-user' exists" "user.cc-user.uid"
+check_value "User ID" "${FACTS[user.cc-user.uid]}"
+check_value "Groups" "${FACTS[user.cc-user.groups]#cc-user }"
+check_fact "Sudo privileges" "user.cc-user.sudo"
 check_exists "Home directory" "/home/cc-user"
 check_exists "SSH directory" "/home/cc-user/.ssh"
 
 # SSH Configuration
 print_header "5. SSH CONFIGURATION"
 check_exists "SSH config directory" "/etc/ssh/sshd_config.d"
-check_exists "Hardening config" "/etc/ssh/sshd_config.d/99-hardening.conf"
+check_exists "Hardening config" "$HARDENING_CONF"
 
-if [[ -f /etc/ssh/sshd_config.d/99-hardening.conf ]]; then
+if [[ -n "${FACTS[path.$HARDENING_CONF]}" ]]; then
     echo -e "\n${BOLD}SSH Security Settings:${NC}"
-    
+
     # Check each security setting
     settings=(
         "PermitRootLogin no:Root login disabled"
@@ -138,12 +334,12 @@ if [[ -f /etc/ssh/sshd_config.d/99-hardening.conf ]]; then
         "MaxAuthTries:Max auth attempts"
         "Protocol 2:SSH Protocol 2 only"
     )
-    
+
     for setting in "${settings[@]}"; do
         key="${setting%%:*}"
         desc="${setting#*:}"
-        value=$(grep "^$key" /etc/ssh/sshd_config.d/99-hardening.conf 2>/dev/null | head -1)
-        if [[ -n "$value" ]]; then
+        value=${FACTS[sshd.hardening.${key%% *}]}
+        if [[ -n "$value" ]] && [[ "$value" == "$key"* ]]; then
             echo -e "  ${GREEN}${CHECK}${NC} $desc"
             echo -e "    ${CYAN}└─${NC} $value"
         else
@@ -154,37 +350,31 @@ fi
 
 # SSH Keys
 print_header "6. SSH KEY AUTHENTICATION"
-if [[ -f /home/cc-user/.ssh/authorized_keys ]]; then
-    key_count=$(wc -l < /home/cc-user/.ssh/authorized_keys)
+if [[ -n "${FACTS[ssh.keys.lines]}" ]]; then
     echo -e "${GREEN}${CHECK}${NC} Authorized keys file exists"
-    echo -e "  ${CYAN}└─${NC} Number of keys: $key_count"
-    
+    echo -e "  ${CYAN}└─${NC} Number of keys: ${FACTS[ssh.keys.lines]}"
+
     # Show key fingerprints
     echo -e "\n${BOLD}SSH Key Fingerprints:${NC}"
-    while IFS= read -r key; do
-        if [[ -n "$key" ]] && [[ ! "$key" =~ ^# ]]; then
-            fingerprint=$(echo "$key" | ssh-keygen -lf - 2>/dev/null | awk '{print $2}')
-            key_type=$(echo "$key" | awk '{print $1}')
-            key_comment=$(echo "$key" | awk '{print $3}')
-            echo -e "  ${GREEN}${CHECK}${NC} Type: $key_type"
-            echo -e "    ${CYAN}├─${NC} Fingerprint: $fingerprint"
-            echo -e "    ${CYAN}└─${NC} Comment: ${key_comment:-'No comment'}"
-        fi
-    done < /home/cc-user/.ssh/authorized_keys
+    for ((i = 0; i < ${FACTS[ssh.keys.count]:-0}; i++)); do
+        IFS=$'\t' read -r key_type fingerprint key_comment <<< "${FACTS[ssh.key.$i]}"
+        echo -e "  ${GREEN}${CHECK}${NC} Type: $key_type"
+        echo -e "    ${CYAN}├─${NC} Fingerprint: $fingerprint"
+        echo -e "    ${CYAN}└─${NC} Comment: ${key_comment:-'No comment'}"
+    done
 else
     echo -e "${RED}${CROSS}${NC} No authorized_keys file found"
 fi
 
 # Firewall Configuration
 print_header "7. FIREWALL (UFW)"
-if command -v ufw >/dev/null 2>&1; then
-    ufw_status=$(sudo ufw status 2>/dev/null | head -1)
-    if [[ "$ufw_status" == *"active"* ]]; then
+if [[ -n "${FACTS[ufw.installed]}" ]]; then
+    if [[ "${FACTS[ufw.status]}" == *"active"* ]]; then
         echo -e "${GREEN}${CHECK}${NC} UFW is active"
         echo -e "\n${BOLD}Allowed Ports:${NC}"
-        sudo ufw status numbered 2>/dev/null | grep -E "^\[" | while read -r line; do
-            echo -e "  ${GREEN}${CHECK}${NC} $line"
-        done
+        while IFS= read -r line; do
+            [[ -n "$line" ]] && echo -e "  ${GREEN}${CHECK}${NC} $line"
+        done <<< "${FACTS[ufw.rules]}"
     else
         echo -e "${RED}${CROSS}${NC} UFW is not active"
     fi
@@ -194,19 +384,16 @@ fi
 
 # Fail2ban Status
 print_header "8. INTRUSION PREVENTION (fail2ban)"
-if systemctl is-active --quiet fail2ban; then
+if [[ "${FACTS[svc.fail2ban]}" == "active" ]]; then
     echo -e "${GREEN}${CHECK}${NC} fail2ban is active"
-    echo -e "  ${CYAN}└─${NC} Status: $(systemctl is-active fail2ban)"
-    
+    echo -e "  ${CYAN}└─${NC} Status: ${FACTS[svc.fail2ban]}"
+
     # Check for active jails
-    if command -v fail2ban-client >/dev/null 2>&1; then
-        jail_list=$(sudo fail2ban-client status 2>/dev/null | grep "Jail list" | cut -d':' -f2 | xargs)
-        if [[ -n "$jail_list" ]]; then
-            echo -e "\n${BOLD}Active Jails:${NC}"
-            for jail in $jail_list; do
-                echo -e "  ${GREEN}${CHECK}${NC} $jail"
-            done
-        fi
+    if [[ -n "${FACTS[fail2ban.jails]}" ]]; then
+        echo -e "\n${BOLD}Active Jails:${NC}"
+        for jail in ${FACTS[fail2ban.jails]//,/ }; do
+            echo -e "  ${GREEN}${CHECK}${NC} $jail"
+        done
     fi
 else
     echo -e "${RED}${CROSS}${NC} fail2ban is not running"
@@ -215,78 +402,54 @@ fi
 # Development Tools
 print_header "9. DEVELOPMENT TOOLS"
 
-# Node.js
-if command -v node >/dev/null 2>&1; then
-    echo -e "${GREEN}${CHECK}${NC} Node.js installed"
-    echo -e "  ${CYAN}└─${NC} Version: $(node --version)"
-else
-    echo -e "${RED}${CROSS}${NC} Node.js not installed"
-fi
-
-# npm
-if command -v npm >/dev/null 2>&1; then
-    echo -e "${GREEN}${CHECK}${NC} npm installed"
-    echo -e "  ${CYAN}└─${NC} Version: $(npm --version)"
-else
-    echo -e "${RED}${CROSS}${NC} npm not installed"
-fi
-
-# 1Password CLI
-if command -v op >/dev/null 2>&1; then
-    echo -e "${GREEN}${CHECK}${NC} 1Password CLI installed"
-    echo -e "  ${CYAN}└─${NC} Version: $(op --version)"
-else
-    echo -e "${RED}${CROSS}${NC} 1Password CLI not installed"
-fi
-
-# Git
-if command -v git >/dev/null 2>&1; then
-    echo -e "${GREEN}${CHECK}${NC} Git installed"
-    echo -e "  ${CYAN}└─${NC} Version: $(git --version | cut -d' ' -f3)"
-else
-    echo -e "${RED}${CROSS}${NC} Git not installed"
-fi
+tools=("node:Node.js" "npm:npm" "op:1Password CLI" "git:Git")
+for tool in "${tools[@]}"; do
+    key="${tool%%:*}"
+    name="${tool#*:}"
+    if [[ -n "${FACTS[tool.$key]}" ]]; then
+        echo -e "${GREEN}${CHECK}${NC} $name installed"
+        echo -e "  ${CYAN}└─${NC} Version: ${FACTS[tool.$key]}"
+    else
+        echo -e "${RED}${CROSS}${NC} $name not installed"
+    fi
+done
 
 # ASW Framework Structure
 print_header "10. ASW FRAMEWORK"
 check_exists "Base directory" "/opt/asw"
 
-if [[ -d /opt/asw ]]; then
+if [[ -n "${FACTS[path./opt/asw]}" ]]; then
     echo -e "\n${BOLD}Framework Components:${NC}"
-    frameworks=("agentic-framework-core" "agentic-framework-dev" "agentic-framework-infrastructure" "agentic-framework-security")
-    
-    for framework in "${frameworks[@]}"; do
-        if [[ -d "/opt/asw/$framework" ]]; then
-            subdir_count=$(find "/opt/asw/$framework" -maxdepth 1 -type d | wc -l)
+
+    for framework in "${FRAMEWORKS[@]}"; do
+        if [[ -n "${FACTS[asw.$framework.subdirs]}" ]]; then
             echo -e "  ${GREEN}${CHECK}${NC} $framework"
-            echo -e "    ${CYAN}└─${NC} Subdirectories: $((subdir_count - 1))"
+            echo -e "    ${CYAN}└─${NC} Subdirectories: ${FACTS[asw.$framework.subdirs]}"
         else
             echo -e "  ${RED}${CROSS}${NC} $framework - Not found"
         fi
     done
-    
+
     # Check for scripts
-    if [[ -d "/opt/asw/scripts" ]]; then
-        script_count=$(ls -1 /opt/asw/scripts/*.sh 2>/dev/null | wc -l)
+    if [[ -n "${FACTS[asw.scripts]}" ]]; then
         echo -e "  ${GREEN}${CHECK}${NC} scripts directory"
-        echo -e "    ${CYAN}└─${NC} Scripts: $script_count"
+        echo -e "    ${CYAN}└─${NC} Scripts: ${FACTS[asw.scripts]}"
     fi
-    
+
     # Check for docs
-    if [[ -d "/opt/asw/docs" ]]; then
-        doc_count=$(ls -1 /opt/asw/docs/*.md 2>/dev/null | wc -l)
+    if [[ -n "${FACTS[asw.docs]}" ]]; then
         echo -e "  ${GREEN}${CHECK}${NC} docs directory"
-        echo -e "    ${CYAN}└─${NC} Documents: $doc_count"
+        echo -e "    ${CYAN}└─${NC} Documents: ${FACTS[asw.docs]}"
     fi
 fi
 
 # Network & Connectivity
 print_header "11. NETWORK & CONNECTIVITY"
-echo -e "${INFO} Primary IP: ${YELLOW}$(hostname -I | awk '{print $1}')${NC}"
-echo -e "${INFO} SSH Port: ${YELLOW}$(grep -E "^Port" /etc/ssh/sshd_config /etc/ssh/sshd_config.d/* 2>/dev/null | awk '{print $2}' | head -1 || echo "22")${NC}"
+echo -e "${INFO} Primary IP: ${YELLOW}${FACTS[sys.ip]}${NC}"
+echo -e "${INFO} SSH Port: ${YELLOW}${FACTS[sshd.effective.port]:-${FACTS[sshd.port]:-22}}${NC}"
 
 # Check SSH service
-if systemctl is-active --quiet ssh; then
+if [[ "${FACTS[svc.ssh]}" == "active" ]]; then
     echo -e "${GREEN}${CHECK}${NC} SSH service is active"
 else
     echo -e "${RED}${CROSS}${NC} SSH service is not active"
@@ -299,20 +462,20 @@ print_header "12. SUMMARY"
 total_checks=0
 successful_checks=0
 
-# Quick re-check of critical items
+# Critical items, answered from the fact snapshot
 critical_items=(
-    "id cc-user"
-    "test -f /etc/ssh/sshd_config.d/99-hardening.conf"
-    "systemctl is-active --quiet ssh"
-    "sudo ufw status | grep -q active"
-    "command -v node"
-    "command -v op"
-    "test -d /opt/asw"
+    "[[ -n \"\${FACTS[user.cc-user.uid]}\" ]]"
+    "[[ -n \"\${FACTS[path.$HARDENING_CONF]}\" ]]"
+    "[[ \"\${FACTS[svc.ssh]}\" == active ]]"
+    "[[ \"\${FACTS[ufw.status]}\" == *active* ]]"
+    "[[ -n \"\${FACTS[tool.node]}\" ]]"
+    "[[ -n \"\${FACTS[tool.op]}\" ]]"
+    "[[ -n \"\${FACTS[path./opt/asw]}\" ]]"
 )
 
 for item in "${critical_items[@]}"; do
     total_checks=$((total_checks + 1))
-    if eval "$item" >/dev/null 2>&1; then
+    if eval "$item"; then
         successful_checks=$((successful_checks + 1))
     fi
 done
@@ -337,4 +500,7 @@ echo ""
 echo -e "${BOLD}${BLUE}═══════════════════════════════════════════════════════════${NC}"
 echo -e "${CYAN}Report generated at: $(date +'%Y-%m-%d %H:%M:%S')${NC}"
 echo -e "${BOLD}${BLUE}═══════════════════════════════════════════════════════════${NC}"
-echo ""
\ No newline at end of file
+if [[ -n "$SAVE_FACTS" ]]; then
+    echo -e "${INFO} Facts saved to: ${YELLOW}${SAVE_FACTS}${NC}"
+fi
+echo ""